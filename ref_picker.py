@@ -1,7 +1,11 @@
 import bpy
 import os
+import json
+import time
 import tempfile
+import contextlib
 import subprocess
+import uuid
 from mathutils import Vector
 import shutil
 from bpy.types import Operator, PropertyGroup, UIList
@@ -16,7 +20,84 @@ bl_info = {
     "description": "Organize reference images in Blender."
 }
 
+# Longest side, in pixels, of the atlas baked for each image frame
+ATLAS_MAX_SIZE = 4096
+
+# UV map spanning 0..1 over an image frame mesh, used to show the atlas in every shading mode
+ATLAS_UV_MAP = "RefPickerAtlas"
+
+# Seconds to wait for another Blender instance to release a lock in the images directory
+LOCK_TIMEOUT = 10
+
+class RefPickerLock:
+    """Advisory inter-process lock on a lock file, used as a context manager"""
+    def __init__(self, path, timeout=LOCK_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self.file = None
+        # Set while holding the lock once the locked folder is gone, so the lock file doesn't pile up
+        self.remove_on_release = False
+
+    def _try_lock(self):
+        try:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:
+            import msvcrt
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock(self):
+        try:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        except ImportError:
+            import msvcrt
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            self.file = open(self.path, 'a+b')
+            try:
+                self._try_lock()
+            except OSError:
+                pass
+            else:
+                # The previous holder may have removed the lock file, then the lock must be taken on the new one
+                try:
+                    if os.path.samestat(os.fstat(self.file.fileno()), os.stat(self.path)):
+                        return self
+                except FileNotFoundError:
+                    pass
+                self._unlock()
+            self.file.close()
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for lock {self.path}")
+            time.sleep(0.1)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self.remove_on_release and os.name != 'nt':
+                self._remove()
+            self._unlock()
+        finally:
+            self.file.close()
+        # Windows can't remove an open file, and fails harmlessly if another instance opened it meanwhile
+        if self.remove_on_release and os.name == 'nt':
+            self._remove()
+
 class RefPicker:
+    # Session of this Blender instance in the images directory it syncs into, see get_session_token
+    session = None
+
     @staticmethod
     def ensure_pillow():
         try:
@@ -45,6 +126,154 @@ class RefPicker:
     def get_images_dir():
         return os.path.join(RefPicker.get_blend_file_dir(), "images")
 
+    @staticmethod
+    def get_owner_id():
+        # Blend files sharing an images directory all sit next to it, so the file name is enough
+        # and stays valid when the project is moved or mounted elsewhere
+        return os.path.basename(bpy.data.filepath)
+
+    @staticmethod
+    def folder_lock(images_dir, folder_name):
+        """Lock a frame folder against Syncs running in other Blender instances"""
+        return RefPickerLock(os.path.join(images_dir, f".{folder_name}.lock"))
+
+    @staticmethod
+    def session_lock(images_dir, token):
+        return RefPickerLock(os.path.join(images_dir, f".session_{token}.lock"), timeout=0)
+
+    @staticmethod
+    def get_session_token(images_dir):
+        """Return this instance's session token, holding its session lock while the blend file stays open"""
+        session = RefPicker.session
+        if session is not None and session["filepath"] == bpy.data.filepath:
+            return session["token"]
+        RefPicker.release_session()
+        token = uuid.uuid4().hex
+        lock = RefPicker.session_lock(images_dir, token)
+        lock.__enter__()
+        RefPicker.session = {"filepath": bpy.data.filepath, "token": token, "lock": lock}
+        return token
+
+    @staticmethod
+    def release_session():
+        session = RefPicker.session
+        RefPicker.session = None
+        if session is not None:
+            session["lock"].remove_on_release = True
+            session["lock"].__exit__(None, None, None)
+
+    @staticmethod
+    def is_session_live(images_dir, token):
+        """Whether the Blender instance that started a session is still running with the same file open"""
+        if RefPicker.session is not None and RefPicker.session["token"] == token:
+            return True
+        try:
+            with RefPicker.session_lock(images_dir, token) as lock:
+                lock.remove_on_release = True
+        except TimeoutError:
+            return True
+        return False
+
+    @staticmethod
+    @contextlib.contextmanager
+    def ownership_record(images_dir):
+        """Yield the ownership record of images_dir and write it back on exit.
+
+        "folders" maps each folder name to the blend file owning it, and "sessions" maps
+        the session token of every instance syncing into images_dir to its blend file.
+        Raises ValueError when the record is corrupt, leaving it untouched."""
+        record_path = os.path.join(images_dir, ".ref_picker_owners.json")
+        with RefPickerLock(record_path + ".lock"):
+            try:
+                with open(record_path, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+            except FileNotFoundError:
+                record = {"folders": {}, "sessions": {}}
+            if not (isinstance(record, dict) and isinstance(record.get("folders"), dict) and isinstance(record.get("sessions"), dict)):
+                raise ValueError(f"{record_path} does not hold folders and sessions")
+            yield record
+            temp_path = record_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(record, f, indent=2)
+            os.replace(temp_path, record_path)
+
+    @staticmethod
+    def claim_folders(record, folder_names, owner_id, images_dir):
+        """Claim folder_names in record and return those owned by a blend file open in another instance"""
+        sessions = record["sessions"]
+        for token in list(sessions):
+            if not RefPicker.is_session_live(images_dir, token):
+                del sessions[token]
+        live_blends = set(session["blend"] for session in sessions.values())
+
+        folders = record["folders"]
+        foreign_folders = [name for name in sorted(folder_names) if folders.get(name, owner_id) != owner_id and folders[name] in live_blends]
+        if not foreign_folders:
+            for folder_name in folder_names:
+                # Folders of blend files no instance has open, e.g. an earlier version of this one, are taken over
+                if folders.get(folder_name, owner_id) != owner_id:
+                    print(f"Took over folder {folder_name} from {folders[folder_name]}, which is not open anywhere")
+                folders[folder_name] = owner_id
+        return foreign_folders
+
+    @staticmethod
+    def claim_unowned_folders(record, images_dir, owner_id, blend_dir):
+        """Claim folders missing from record, such as those synced before ownership was recorded,
+        as long as no other blend file shares images_dir"""
+        if any(name.lower().endswith(".blend") and name != owner_id for name in os.listdir(blend_dir)):
+            return
+        for folder_name in os.listdir(images_dir):
+            if folder_name not in record["folders"] and os.path.isdir(os.path.join(images_dir, folder_name)):
+                record["folders"][folder_name] = owner_id
+                print(f"Claimed unowned folder {folder_name}")
+
+    @staticmethod
+    def is_used_elsewhere(record, folder_name, owner_id, images_dir):
+        """Whether another running instance with the same blend file open still associates folder_name"""
+        own_token = RefPicker.session["token"] if RefPicker.session is not None else None
+        return any(token != own_token and session["blend"] == owner_id and folder_name in session.get("folders", ())
+                   and RefPicker.is_session_live(images_dir, token)
+                   for token, session in list(record["sessions"].items()))
+
+    @staticmethod
+    def remove_folder(images_dir, folder_name):
+        """Delete a folder owned by this blend file and release it, unless another instance of the
+        same blend file still uses it. Returns whether the folder was removed."""
+        owner_id = RefPicker.get_owner_id()
+        folder_path = os.path.join(images_dir, folder_name)
+        with RefPicker.folder_lock(images_dir, folder_name) as lock:
+            # Check and delete under the record lock, so no instance can start using the folder in between
+            with RefPicker.ownership_record(images_dir) as record:
+                if record["folders"].get(folder_name) != owner_id:
+                    return False
+                if RefPicker.is_used_elsewhere(record, folder_name, owner_id, images_dir):
+                    print(f"Kept folder {folder_path}, another instance of this blend file uses it")
+                    return False
+                if os.path.isdir(folder_path):
+                    shutil.rmtree(folder_path, onerror=RefPicker.remove_readonly)
+                    print(f"Deleted folder and its contents: {folder_path}")
+                del record["folders"][folder_name]
+            lock.remove_on_release = True
+        return True
+
+    @staticmethod
+    def start_sync(images_dir, associated_folders):
+        """Record a Sync of associated_folders and return (foreign_folders, removable_folders).
+
+        foreign_folders maps the associated folders owned by a blend file open in another
+        instance to that blend file; removable_folders are the unassociated folders this
+        blend file owns and no other running instance of it still uses."""
+        owner_id = RefPicker.get_owner_id()
+        session_token = RefPicker.get_session_token(images_dir)
+        with RefPicker.ownership_record(images_dir) as record:
+            record["sessions"][session_token] = {"blend": owner_id, "folders": sorted(associated_folders)}
+            foreign_folders = RefPicker.claim_folders(record, associated_folders, owner_id, images_dir)
+            RefPicker.claim_unowned_folders(record, images_dir, owner_id, RefPicker.get_blend_file_dir())
+            owned_folders = set(name for name, owner in record["folders"].items() if owner == owner_id)
+            removable_folders = set(name for name in owned_folders - set(associated_folders)
+                                    if not RefPicker.is_used_elsewhere(record, name, owner_id, images_dir))
+            return {name: record["folders"][name] for name in foreign_folders}, removable_folders
+
     @staticmethod
     def get_reffolder_objects():
         return [obj for obj in bpy.data.objects if obj.name.startswith("reffolder_")]
@@ -179,22 +408,41 @@ class RefPicker:
         # Create a set of associated folder names
         associated_folders = set(reffolder_obj.name.replace("reffolder_", "") for reffolder_obj in reffolder_objects)
 
-        # List all folders in the images directory
-        all_folders = set(os.listdir(images_dir))
-
-        # Find unassociated folders
-        unassociated_folders = all_folders - associated_folders
+        # Claim the associated folders, unless a blend file open in another instance owns them
+        try:
+            foreign_folders, unassociated_folders = RefPicker.start_sync(images_dir, associated_folders)
+        except TimeoutError as e:
+            RefPicker.show_popup(f"{e}\nanother Blender instance is syncing, please try again.", title="Images Directory Busy", icon='ERROR')
+            return {'CANCELLED'}
+        except ValueError as e:
+            RefPicker.show_popup(f"The ownership record is corrupt:\n{e}\nplease fix .ref_picker_owners.json in the images folder.", title="Ownership Record Corrupt", icon='ERROR')
+            return {'CANCELLED'}
+        if foreign_folders:
+            foreign_info = "\n".join(f"{name} ({owner})" for name, owner in sorted(foreign_folders.items()))
+            RefPicker.show_popup(f"These folders belong to blend files open in other Blender instances:\n{foreign_info}\nplease rename the image frames, or close those files to take the folders over.", title="Folder In Use", icon='ERROR')
+            return {'CANCELLED'}
 
-        # Process unassociated folders
-        for folder_name in unassociated_folders:
-            folder_path = os.path.join(images_dir, folder_name)
-            if os.path.isdir(folder_path):
+        # Hold the lock of every associated folder until the Sync is done
+        with contextlib.ExitStack() as folder_locks:
+            try:
+                for folder_name in sorted(associated_folders):
+                    folder_locks.enter_context(RefPicker.folder_lock(images_dir, folder_name))
+            except TimeoutError as e:
+                RefPicker.show_popup(f"{e}\nanother Blender instance is syncing this frame, please try again.", title="Folder Busy", icon='ERROR')
+                return {'CANCELLED'}
+
+            # Process unassociated folders, which only include those owned by this blend file
+            for folder_name in unassociated_folders:
+                folder_path = os.path.join(images_dir, folder_name)
                 try:
-                    shutil.rmtree(folder_path, onerror=RefPicker.remove_readonly)
-                    print(f"Deleted folder and its contents: {folder_path}")
+                    RefPicker.remove_folder(images_dir, folder_name)
                 except Exception as e:
                     print(f"Failed to delete folder and its contents: {folder_path} - {e}")
 
+            return RefPicker.sync_frame_folders(reffolder_objects, images_dir)
+
+    @staticmethod
+    def sync_frame_folders(reffolder_objects, images_dir):
         # Check for overlapping bounding boxes
         if RefPicker.check_overlapping_bboxes(reffolder_objects):
             return {'CANCELLED'}
@@ -207,7 +455,7 @@ class RefPicker:
 
         images_to_remove = set()
         for image in bpy.data.images:
-            if image.source == 'FILE':
+            if image.source == 'FILE' and not image.get("ref_picker_atlas"):
                 source_file = bpy.path.abspath(image.filepath)
                 if not os.path.exists(source_file):
                     print(f"Source file does not exist: {source_file}")
@@ -345,6 +593,10 @@ class RefPicker:
                 obj.location = (current_row_x, y_offset, 0)
                 current_row_x += obj_size + 0.5
 
+        # Rebake the atlases of frames whose images changed
+        if bpy.context.scene.enable_atlas_display:
+            RefPicker.build_atlases(reffolder_objects)
+
         return {'FINISHED'}
 
     @staticmethod
@@ -359,15 +611,22 @@ class RefPicker:
                 if os.path.exists(new_reffolder_path):
                     return f"Folder '{new_reffolder_path}' already exists. Please choose a different name."
 
-                # Rename the object
-                obj.name = f"reffolder_{new_name}"
                 # Rename the associated folder
                 old_reffolder_path = os.path.join(images_dir, reffolder_name)
-                if os.path.exists(old_reffolder_path):
-                    os.rename(old_reffolder_path, new_reffolder_path)
-                    print(f"Renamed folder {old_reffolder_path} to {new_reffolder_path}")
-                else:
-                    print(f"Folder {old_reffolder_path} does not exist")
+                try:
+                    # Before the first Sync there is neither a folder nor an ownership record
+                    conflict_message = RefPicker.rename_folder(images_dir, reffolder_name, new_name) if os.path.isdir(images_dir) else None
+                except TimeoutError as e:
+                    return f"{e}. Another Blender instance is syncing, please try again."
+                except ValueError as e:
+                    return f"The ownership record is corrupt: {e}. Please fix .ref_picker_owners.json in the images folder."
+                except OSError as e:
+                    return f"Failed to rename folder {old_reffolder_path} to {new_reffolder_path}: {e}"
+                if conflict_message:
+                    return conflict_message
+
+                # Rename the object
+                obj.name = f"reffolder_{new_name}"
 
                 # Update image paths in data
                 for image in bpy.data.images:
@@ -384,8 +643,36 @@ class RefPicker:
                         child.data.body = new_name
                         print(f"Updated text object '{child.name}' to '{new_name}'")                  
 
+                # Update the atlas baked for this frame
+                RefPicker.rename_atlas(obj, new_name)
+
         return "Folders renamed successfully"
 
+    @staticmethod
+    def rename_folder(images_dir, old_name, new_name):
+        """Rename a folder and hand its ownership over to the new name, with the same rules Sync claims
+        folders by. Returns an error message when new_name belongs to a blend file open elsewhere."""
+        owner_id = RefPicker.get_owner_id()
+        old_path = os.path.join(images_dir, old_name)
+        new_path = os.path.join(images_dir, new_name)
+        with RefPicker.folder_lock(images_dir, old_name) as lock:
+            # The record is only written back once the folder has been renamed
+            with RefPicker.ownership_record(images_dir) as record:
+                if RefPicker.claim_folders(record, {new_name}, owner_id, images_dir):
+                    return f"Folder '{new_path}' belongs to {record['folders'][new_name]}, which is open in another Blender instance. Please choose a different name."
+                if os.path.exists(old_path):
+                    os.rename(old_path, new_path)
+                    print(f"Renamed folder {old_path} to {new_path}")
+                else:
+                    print(f"Folder {old_path} does not exist")
+                if record["folders"].get(old_name) == owner_id:
+                    del record["folders"][old_name]
+                session = record["sessions"].get(RefPicker.session["token"]) if RefPicker.session is not None else None
+                if session is not None and old_name in session["folders"]:
+                    session["folders"] = sorted(set(session["folders"]) - {old_name} | {new_name})
+            lock.remove_on_release = True
+        return None
+
     @staticmethod
     def check_overlapping_bboxes(reffolder_objects):
         """Check if any of the folder objects have overlapping bounding boxes"""
@@ -415,6 +702,223 @@ class RefPicker:
 
         return False
 
+    @staticmethod
+    def get_frame_bounds(reffolder_obj):
+        """Return (x_min, y_min, x_max, y_max) of a folder object in world space"""
+        reffolder_bbox_min = reffolder_obj.matrix_world @ Vector(reffolder_obj.bound_box[0])
+        reffolder_bbox_max = reffolder_obj.matrix_world @ Vector(reffolder_obj.bound_box[7])
+        return reffolder_bbox_min.x, reffolder_bbox_min.y, reffolder_bbox_max.x, reffolder_bbox_max.y
+
+    @staticmethod
+    def get_mesh_bounds(reffolder_obj):
+        """Return (x_min, y_min, x_max, y_max) of a folder object's mesh in world space, ignoring modifiers"""
+        corners = [reffolder_obj.matrix_world @ vertex.co for vertex in reffolder_obj.data.vertices]
+        if not corners:
+            return RefPicker.get_frame_bounds(reffolder_obj)
+        return min(c.x for c in corners), min(c.y for c in corners), max(c.x for c in corners), max(c.y for c in corners)
+
+    @staticmethod
+    def ensure_atlas_uv(mesh):
+        """Give a frame mesh the UV map the atlas is shown with, spanning 0..1 over its bounds"""
+        uv_layer = mesh.uv_layers.get(ATLAS_UV_MAP) or mesh.uv_layers.new(name=ATLAS_UV_MAP)
+        if mesh.vertices:
+            x_min = min(v.co.x for v in mesh.vertices)
+            y_min = min(v.co.y for v in mesh.vertices)
+            width = (max(v.co.x for v in mesh.vertices) - x_min) or 1.0
+            height = (max(v.co.y for v in mesh.vertices) - y_min) or 1.0
+            for loop in mesh.loops:
+                co = mesh.vertices[loop.vertex_index].co
+                uv_layer.data[loop.index].uv = ((co.x - x_min) / width, (co.y - y_min) / height)
+        # Solid shading samples the active image node with the active UV map
+        mesh.uv_layers.active = uv_layer
+        return uv_layer
+
+    @staticmethod
+    def get_frame_image_objects(reffolder_obj):
+        """Return the image empties whose location lies inside a folder object"""
+        x_min, y_min, x_max, y_max = RefPicker.get_frame_bounds(reffolder_obj)
+        frame_objects = []
+        for obj in bpy.context.collection.objects:
+            if obj.type == 'EMPTY' and obj.empty_display_type == 'IMAGE' and obj.data:
+                x, y, _ = obj.matrix_world.translation
+                if x_min <= x <= x_max and y_min <= y <= y_max:
+                    frame_objects.append(obj)
+        frame_objects.sort(key=lambda obj: obj.name)
+        return frame_objects
+
+    @staticmethod
+    def get_image_rect(obj, image_size):
+        """Return (x_min, y_min, x_max, y_max) covered by an image empty in world space"""
+        width, height = image_size
+        if not width or not height:
+            return None
+        display_size = obj.empty_display_size * obj.matrix_world.to_scale().x
+        rect_width = display_size * width / max(width, height)
+        rect_height = display_size * height / max(width, height)
+        x, y, _ = obj.matrix_world.translation
+        x_min = x + obj.empty_image_offset[0] * rect_width
+        y_min = y + obj.empty_image_offset[1] * rect_height
+        return x_min, y_min, x_min + rect_width, y_min + rect_height
+
+    @staticmethod
+    def get_atlas_signature(reffolder_obj, frame_objects):
+        """Hash everything that affects the look of a frame's atlas"""
+        import hashlib
+        signature = hashlib.sha1()
+        signature.update(repr((ATLAS_MAX_SIZE, RefPicker.get_mesh_bounds(reffolder_obj))).encode())
+        for obj in frame_objects:
+            source_file = bpy.path.abspath(obj.data.filepath)
+            try:
+                mtime = os.path.getmtime(source_file)
+            except OSError:
+                mtime = None
+            rect = RefPicker.get_image_rect(obj, tuple(obj.data.size))
+            signature.update(repr((obj.name, source_file, mtime, rect)).encode())
+        return signature.hexdigest()
+
+    @staticmethod
+    def bake_atlas(reffolder_obj, frame_objects):
+        """Paste the images of a frame into a single atlas image covering the frame's mesh"""
+        import numpy as np
+        from PIL import Image
+
+        x_min, y_min, x_max, y_max = RefPicker.get_mesh_bounds(reffolder_obj)
+        frame_width, frame_height = x_max - x_min, y_max - y_min
+        if frame_width <= 0 or frame_height <= 0:
+            return None
+        scale = ATLAS_MAX_SIZE / max(frame_width, frame_height)
+        atlas_width = max(1, round(frame_width * scale))
+        atlas_height = max(1, round(frame_height * scale))
+        atlas = Image.new('RGBA', (atlas_width, atlas_height), (0, 0, 0, 0))
+
+        for obj in frame_objects:
+            source_file = bpy.path.abspath(obj.data.filepath)
+            try:
+                img = Image.open(source_file).convert('RGBA')
+            except Exception as e:
+                print(f"Failed to add {source_file} to atlas: {e}")
+                continue
+            rect = RefPicker.get_image_rect(obj, img.size)
+            if rect is None:
+                continue
+            left = round((rect[0] - x_min) * scale)
+            top = round((y_max - rect[3]) * scale)
+            width = max(1, round((rect[2] - rect[0]) * scale))
+            height = max(1, round((rect[3] - rect[1]) * scale))
+            img = img.resize((width, height), Image.LANCZOS)
+            atlas.paste(img, (left, top), img)
+
+        atlas_name = f"refatlas_{reffolder_obj.name.replace('reffolder_', '')}"
+        atlas_image = bpy.data.images.get(reffolder_obj.get("ref_picker_atlas", ""))
+        if atlas_image is None:
+            atlas_image = bpy.data.images.new(atlas_name, atlas_width, atlas_height, alpha=True)
+        elif tuple(atlas_image.size) != (atlas_width, atlas_height):
+            atlas_image.scale(atlas_width, atlas_height)
+        pixels = np.asarray(atlas.transpose(Image.FLIP_TOP_BOTTOM), dtype=np.float32) / 255.0
+        atlas_image.pixels.foreach_set(pixels.ravel())
+        atlas_image.pack()
+        # Sync backs up every file image, so mark the atlas to keep it out of the folders
+        atlas_image["ref_picker_atlas"] = True
+        reffolder_obj["ref_picker_atlas"] = atlas_image.name
+        print(f"Baked {len(frame_objects)} images into atlas {atlas_image.name}")
+        return atlas_image
+
+    @staticmethod
+    def get_atlas_material(reffolder_obj, atlas_image):
+        """Return the per-object material showing atlas_image on the folder object"""
+        material = bpy.data.materials.get(reffolder_obj.get("ref_picker_atlas_material", ""))
+        if material is None:
+            material = bpy.data.materials.new(f"refatlas_{reffolder_obj.name.replace('reffolder_', '')}")
+            reffolder_obj["ref_picker_atlas_material"] = material.name
+            material.use_nodes = True
+            material.blend_method = 'BLEND'
+            nodes = material.node_tree.nodes
+            links = material.node_tree.links
+            nodes.clear()
+            uv_map = nodes.new('ShaderNodeUVMap')
+            uv_map.uv_map = ATLAS_UV_MAP
+            tex_image = nodes.new('ShaderNodeTexImage')
+            emission = nodes.new('ShaderNodeEmission')
+            transparent = nodes.new('ShaderNodeBsdfTransparent')
+            mix = nodes.new('ShaderNodeMixShader')
+            output = nodes.new('ShaderNodeOutputMaterial')
+            links.new(uv_map.outputs['UV'], tex_image.inputs['Vector'])
+            links.new(tex_image.outputs['Color'], emission.inputs['Color'])
+            links.new(tex_image.outputs['Alpha'], mix.inputs['Fac'])
+            links.new(transparent.outputs['BSDF'], mix.inputs[1])
+            links.new(emission.outputs['Emission'], mix.inputs[2])
+            links.new(mix.outputs['Shader'], output.inputs['Surface'])
+            nodes.active = tex_image
+        for node in material.node_tree.nodes:
+            if node.type == 'TEX_IMAGE':
+                node.image = atlas_image
+        return material
+
+    @staticmethod
+    def rename_atlas(reffolder_obj, new_name):
+        """Rename the atlas image and material of a folder object after the folder itself"""
+        for key, data in (("ref_picker_atlas", bpy.data.images), ("ref_picker_atlas_material", bpy.data.materials)):
+            datablock = data.get(reffolder_obj.get(key, ""))
+            if datablock is not None:
+                datablock.name = f"refatlas_{new_name}"
+                reffolder_obj[key] = datablock.name
+
+    @staticmethod
+    def set_atlas_display(reffolder_obj, material):
+        """Show material on the folder object, or restore the wireframe frame when material is None"""
+        if material is not None:
+            RefPicker.ensure_atlas_uv(reffolder_obj.data)
+            if not reffolder_obj.material_slots:
+                reffolder_obj.data.materials.append(None)
+        if reffolder_obj.material_slots:
+            # Frames created by the template share one mesh, so link the atlas to the object
+            slot = reffolder_obj.material_slots[0]
+            slot.link = 'OBJECT' if material is not None else 'DATA'
+            if material is not None:
+                slot.material = material
+        for modifier in reffolder_obj.modifiers:
+            if modifier.type == 'WIREFRAME':
+                modifier.show_viewport = material is None
+
+    @staticmethod
+    def build_atlases(reffolder_objects):
+        """Rebuild the atlas of every frame whose images changed and hide the baked empties"""
+        if not RefPicker.ensure_pillow():
+            RefPicker.install_pillow()
+            return
+        bpy.context.view_layer.update()
+        for reffolder_obj in reffolder_objects:
+            frame_objects = RefPicker.get_frame_image_objects(reffolder_obj)
+            atlas_image = bpy.data.images.get(reffolder_obj.get("ref_picker_atlas", ""))
+            if not frame_objects:
+                # Nothing to bake, so keep the wireframe and free an atlas left from earlier
+                RefPicker.set_atlas_display(reffolder_obj, None)
+                if atlas_image is not None:
+                    bpy.data.images.remove(atlas_image, do_unlink=True)
+                for key in ("ref_picker_atlas", "ref_picker_atlas_signature"):
+                    if key in reffolder_obj:
+                        del reffolder_obj[key]
+                continue
+            signature = RefPicker.get_atlas_signature(reffolder_obj, frame_objects)
+            if atlas_image is None or reffolder_obj.get("ref_picker_atlas_signature") != signature:
+                atlas_image = RefPicker.bake_atlas(reffolder_obj, frame_objects)
+                if atlas_image is None:
+                    continue
+                reffolder_obj["ref_picker_atlas_signature"] = signature
+            else:
+                print(f"Atlas {atlas_image.name} is up to date, skipping.")
+            RefPicker.set_atlas_display(reffolder_obj, RefPicker.get_atlas_material(reffolder_obj, atlas_image))
+            for obj in frame_objects:
+                obj.hide_set(True)
+
+    @staticmethod
+    def clear_atlases(reffolder_objects):
+        """Show the individual image empties again and restore the wireframe frames"""
+        for reffolder_obj in reffolder_objects:
+            RefPicker.set_atlas_display(reffolder_obj, None)
+            for obj in RefPicker.get_frame_image_objects(reffolder_obj):
+                obj.hide_set(False)
+
 class RefPickerRenameFoldersOperator(Operator, PropertyGroup):
     bl_idname = "image.rename_folders"
     bl_label = "Rename Folders"
@@ -544,6 +1048,27 @@ class ShowPathInfoOperator(bpy.types.Operator):
 
         return {'FINISHED'}
 
+class AtlasEditImageOperator(bpy.types.Operator):
+    bl_idname = "image.atlas_edit_image"
+    bl_label = "Edit Image"
+    bl_description = "Reveal and select the image under the 3D cursor in atlas display mode"
+
+    def execute(self, context):
+        cursor_x, cursor_y, _ = context.scene.cursor.location
+        for reffolder_obj in RefPicker.get_reffolder_objects():
+            # Later objects are drawn on top, so search them first
+            for obj in reversed(RefPicker.get_frame_image_objects(reffolder_obj)):
+                rect = RefPicker.get_image_rect(obj, tuple(obj.data.size))
+                if rect and rect[0] <= cursor_x <= rect[2] and rect[1] <= cursor_y <= rect[3]:
+                    bpy.ops.object.select_all(action='DESELECT')
+                    obj.hide_set(False)
+                    obj.select_set(True)
+                    context.view_layer.objects.active = obj
+                    return {'FINISHED'}
+
+        RefPicker.show_popup("Place the 3D cursor on an image in a frame first.", title="No Image Found", icon='INFO')
+        return {'CANCELLED'}
+
 class RefPickerPanel(bpy.types.Panel):
     bl_label = "Ref Picker"
     bl_idname = "IMAGE_PT_ref_picker"
@@ -562,6 +1087,9 @@ class RefPickerPanel(bpy.types.Panel):
         row.operator("image.show_path_info", text="", icon='INFO')
         row = layout.row()
         row.prop(context.window_manager, "enable_ctrl_v_paste", text="Enable Ctrl+V Paste")
+        row = layout.row(align=True)
+        row.prop(context.scene, "enable_atlas_display", text="Atlas Display")
+        row.operator("image.atlas_edit_image", text="", icon='RESTRICT_SELECT_OFF')
 
 class ModalHandlerOperator(bpy.types.Operator):
     bl_idname = "image.modal_handler"
@@ -595,6 +1123,7 @@ class HelpOperator(bpy.types.Operator):
         # Create mesh data
         mesh = bpy.data.meshes.new("refoldermesh")
         mesh.from_pydata(verts, [], faces)
+        RefPicker.ensure_atlas_uv(mesh)
 
         # Object information
         objects_info = [
@@ -644,6 +1173,19 @@ def enable_ctrl_v_paste_update(self, context):
     if self.enable_ctrl_v_paste:  # self is WindowManager now
         bpy.ops.image.modal_handler('INVOKE_DEFAULT')
 
+@bpy.app.handlers.persistent
+def release_session_handler(dummy):
+    # Opening or saving under another name ends this instance's session for the previous blend file
+    if RefPicker.session is not None and RefPicker.session["filepath"] != bpy.data.filepath:
+        RefPicker.release_session()
+
+def enable_atlas_display_update(self, context):
+    reffolder_objects = RefPicker.get_reffolder_objects()
+    if self.enable_atlas_display:  # self is Scene, so the mode is saved with the frames it changes
+        RefPicker.build_atlases(reffolder_objects)
+    else:
+        RefPicker.clear_atlases(reffolder_objects)
+
 # Register and unregister functions
 def register():
     bpy.utils.register_class(RefPickerOperator)
@@ -653,12 +1195,22 @@ def register():
     bpy.utils.register_class(ModalHandlerOperator)
     bpy.utils.register_class(RefPickerRenameFoldersOperator)
     bpy.utils.register_class(HelpOperator)
+    bpy.utils.register_class(AtlasEditImageOperator)
     bpy.types.WindowManager.enable_ctrl_v_paste = bpy.props.BoolProperty(
         name="Enable Ctrl+V Paste",
         default=False,
         update=enable_ctrl_v_paste_update,
         options={'SKIP_SAVE'}
     )
+    bpy.types.Scene.enable_atlas_display = bpy.props.BoolProperty(
+        name="Atlas Display",
+        description="Show each image frame as one baked texture instead of individual images",
+        default=False,
+        update=enable_atlas_display_update
+    )
+
+    bpy.app.handlers.load_post.append(release_session_handler)
+    bpy.app.handlers.save_post.append(release_session_handler)
 
     # Only call modal_handler when running in Blender
     if not bpy.app.background:
@@ -672,7 +1224,12 @@ def unregister():
     bpy.utils.unregister_class(ModalHandlerOperator)
     bpy.utils.unregister_class(RefPickerRenameFoldersOperator)
     bpy.utils.unregister_class(HelpOperator)
+    bpy.utils.unregister_class(AtlasEditImageOperator)
     del bpy.types.WindowManager.enable_ctrl_v_paste
+    del bpy.types.Scene.enable_atlas_display
+    bpy.app.handlers.load_post.remove(release_session_handler)
+    bpy.app.handlers.save_post.remove(release_session_handler)
+    RefPicker.release_session()
 
     # Only call modal_handler when running in Blender
     if not bpy.app.background:
@@ -0,0 +1,51 @@
+"""Minimal stand-in for bpy and mathutils so ref_picker.py imports outside Blender.
+
+Test modules import this before ref_picker; it is a plain module rather than a
+conftest so that processes started with the spawn method install it too.
+"""
+import os
+import sys
+import types
+
+
+class FakePixels:
+    def foreach_set(self, values):
+        self.values = values
+
+
+class FakeImage(dict):
+    """Generated image with custom properties, as returned by bpy.data.images.new"""
+    def __init__(self, name, width, height):
+        super().__init__()
+        self.name = name
+        self.size = (width, height)
+        self.pixels = FakePixels()
+        self.packed = False
+
+    def scale(self, width, height):
+        self.size = (width, height)
+
+    def pack(self):
+        self.packed = True
+
+
+class FakeImages(dict):
+    def new(self, name, width, height, alpha=False):
+        self[name] = FakeImage(name, width, height)
+        return self[name]
+
+
+if "bpy" not in sys.modules:
+    bpy = types.ModuleType("bpy")
+    bpy.types = types.ModuleType("bpy.types")
+    for name in ("Operator", "Panel", "PropertyGroup", "UIList"):
+        setattr(bpy.types, name, type(name, (), {}))
+    bpy.app = types.SimpleNamespace(handlers=types.SimpleNamespace(persistent=lambda handler: handler))
+    bpy.props = types.SimpleNamespace(BoolProperty=lambda **kwargs: None, CollectionProperty=lambda **kwargs: None)
+    bpy.data = types.SimpleNamespace(filepath="", images=FakeImages())
+    bpy.path = types.SimpleNamespace(abspath=lambda path: path)
+    mathutils = types.ModuleType("mathutils")
+    mathutils.Vector = tuple
+    sys.modules.update({"bpy": bpy, "bpy.types": bpy.types, "mathutils": mathutils})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,79 @@
+"""Checks of the atlas placement math that runs without Blender."""
+import types
+
+import pytest
+
+import bpy_stub
+import ref_picker
+from ref_picker import RefPicker
+
+
+class FakeMatrix:
+    """Translation and uniform scale, enough for matrix_world in a flat board"""
+    def __init__(self, x=0.0, y=0.0, scale=1.0):
+        self.translation = (x, y, 0.0)
+        self.scale = scale
+
+    def to_scale(self):
+        return types.SimpleNamespace(x=self.scale)
+
+    def __matmul__(self, co):
+        return types.SimpleNamespace(x=co.x * self.scale + self.translation[0], y=co.y * self.scale + self.translation[1])
+
+
+class FakeFrame(dict):
+    def __init__(self, name, half_width, half_height):
+        super().__init__()
+        self.name = name
+        self.matrix_world = FakeMatrix()
+        corners = [(-half_width, -half_height), (half_width, -half_height), (-half_width, half_height), (half_width, half_height)]
+        self.data = types.SimpleNamespace(vertices=[types.SimpleNamespace(co=types.SimpleNamespace(x=x, y=y)) for x, y in corners])
+
+
+def image_empty(filepath, size, x, y, display_size=10.0, offset=(-0.5, -0.5), scale=1.0):
+    return types.SimpleNamespace(
+        name=filepath,
+        data=types.SimpleNamespace(filepath=filepath, size=size),
+        matrix_world=FakeMatrix(x, y, scale),
+        empty_display_size=display_size,
+        empty_image_offset=offset,
+    )
+
+
+def test_image_rect_keeps_aspect_of_wide_and_tall_images():
+    assert RefPicker.get_image_rect(image_empty("a.png", (200, 100), 5, 10), (200, 100)) == (0.0, 7.5, 10.0, 12.5)
+    assert RefPicker.get_image_rect(image_empty("a.png", (100, 400), 0, 0), (100, 400)) == (-1.25, -5.0, 1.25, 5.0)
+
+
+def test_image_rect_follows_offset_and_scale():
+    assert RefPicker.get_image_rect(image_empty("a.png", (200, 100), 5, 10, offset=(0.0, 0.0)), (200, 100)) == (5.0, 10.0, 15.0, 15.0)
+    assert RefPicker.get_image_rect(image_empty("a.png", (200, 100), 5, 10, offset=(-1.0, -1.0), scale=2.0), (200, 100)) == (-15.0, 0.0, 5.0, 10.0)
+
+
+def test_image_rect_of_unloaded_image_is_none():
+    assert RefPicker.get_image_rect(image_empty("a.png", (0, 0), 0, 0), (0, 0)) is None
+
+
+def test_bake_places_images_upright(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(ref_picker, "ATLAS_MAX_SIZE", 64)
+    monkeypatch.setattr(bpy_stub.bpy.data, "images", bpy_stub.FakeImages())
+
+    # Top half red, bottom half blue
+    source = Image.new("RGBA", (200, 100), (0, 0, 255, 255))
+    source.paste((255, 0, 0, 255), (0, 0, 200, 50))
+    source.save(tmp_path / "split.png")
+
+    frame = FakeFrame("reffolder_board", 20, 10)
+    atlas = RefPicker.bake_atlas(frame, [image_empty(str(tmp_path / "split.png"), (200, 100), 5, 0)])
+
+    assert atlas.size == (64, 32)
+    assert atlas.packed and atlas["ref_picker_atlas"] and frame["ref_picker_atlas"] == atlas.name
+    # Blender stores pixels bottom row first; the image covers x 0..10, y -2.5..2.5 at 1.6 px per unit
+    pixels = np.asarray(atlas.pixels.values).reshape(32, 64, 4)
+    def pixel_at(x, y):
+        return tuple(np.round(pixels[int((y + 10) * 1.6), int((x + 20) * 1.6)], 2))
+    assert pixel_at(5, 1.5) == (1.0, 0.0, 0.0, 1.0)
+    assert pixel_at(5, -1.5) == (0.0, 0.0, 1.0, 1.0)
+    assert pixel_at(-10, 0)[3] == 0.0
@@ -0,0 +1,193 @@
+"""Multi-process checks of the folder locks and ownership record shared between Blender instances.
+
+Only the parts of ref_picker.py that do not touch Blender are exercised here.
+"""
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+import bpy_stub
+from ref_picker import RefPicker, RefPickerLock
+
+
+def hold_lock(images_dir, folder_name, seconds, locked):
+    with RefPicker.folder_lock(images_dir, folder_name):
+        locked.set()
+        time.sleep(seconds)
+
+
+def wait_for_lock(lock_path, results):
+    with RefPickerLock(lock_path) as lock:
+        results.put(os.path.samestat(os.fstat(lock.file.fileno()), os.stat(lock_path)))
+
+
+def claim_many(images_dir, owner_id, count):
+    for i in range(count):
+        with RefPicker.ownership_record(images_dir) as record:
+            record["folders"][f"{owner_id}-{i}"] = owner_id
+
+
+def run_instance(blend_path, associated_folders, synced, quit):
+    """Sync associated_folders as a Blender instance with blend_path open, until quit is set"""
+    # A forked process inherits the parent's session, which a separate instance would not have
+    RefPicker.session = None
+    bpy_stub.bpy.data.filepath = blend_path
+    images_dir = os.path.join(os.path.dirname(blend_path), "images")
+    RefPicker.start_sync(images_dir, associated_folders)
+    for folder_name in associated_folders:
+        os.makedirs(os.path.join(images_dir, folder_name), exist_ok=True)
+    synced.set()
+    quit.wait(10)
+    RefPicker.release_session()
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Project directory whose images directory this process syncs into as board_v2.blend"""
+    (tmp_path / "images").mkdir()
+    (tmp_path / "board.blend").touch()
+    (tmp_path / "board_v2.blend").touch()
+    monkeypatch.setattr(bpy_stub.bpy.data, "filepath", str(tmp_path / "board_v2.blend"))
+    yield tmp_path
+    RefPicker.release_session()
+
+
+def start_instance(blend_path, associated_folders):
+    synced, quit = multiprocessing.Event(), multiprocessing.Event()
+    instance = multiprocessing.Process(target=run_instance, args=(str(blend_path), associated_folders, synced, quit))
+    instance.start()
+    assert synced.wait(10)
+    return instance, quit
+
+
+def test_folder_lock_blocks_other_process_until_timeout(tmp_path):
+    locked = multiprocessing.Event()
+    holder = multiprocessing.Process(target=hold_lock, args=(str(tmp_path), "frame", 2, locked))
+    holder.start()
+    try:
+        assert locked.wait(10)
+        with pytest.raises(TimeoutError):
+            with RefPickerLock(str(tmp_path / ".frame.lock"), timeout=0.3):
+                pass
+        # Other frames stay free while one is being synced
+        with RefPickerLock(str(tmp_path / ".other.lock"), timeout=0.3):
+            pass
+    finally:
+        holder.join()
+
+
+def test_folder_lock_acquired_after_other_process_releases(tmp_path):
+    locked = multiprocessing.Event()
+    holder = multiprocessing.Process(target=hold_lock, args=(str(tmp_path), "frame", 0.5, locked))
+    holder.start()
+    assert locked.wait(10)
+    started = time.monotonic()
+    with RefPicker.folder_lock(str(tmp_path), "frame"):
+        assert time.monotonic() - started > 0.2
+    holder.join()
+
+
+def test_waiter_locks_the_new_file_after_lock_file_is_removed(tmp_path):
+    lock_path = str(tmp_path / ".frame.lock")
+    results = multiprocessing.Queue()
+    with RefPickerLock(lock_path) as lock:
+        waiter = multiprocessing.Process(target=wait_for_lock, args=(lock_path, results))
+        waiter.start()
+        time.sleep(0.5)
+        lock.remove_on_release = True
+    assert results.get(timeout=10) is True
+    waiter.join()
+
+
+def test_concurrent_ownership_updates_are_kept(tmp_path):
+    workers = [multiprocessing.Process(target=claim_many, args=(str(tmp_path), f"board{i}.blend", 20)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    with open(tmp_path / ".ref_picker_owners.json", encoding="utf-8") as f:
+        assert len(json.load(f)["folders"]) == 80
+
+
+def test_folders_are_taken_over_only_when_their_blend_file_is_not_open(project):
+    images_dir = str(project / "images")
+    instance, quit = start_instance(project / "board.blend", {"a"})
+    try:
+        # The earlier version is still open elsewhere, so its folder is refused
+        assert RefPicker.start_sync(images_dir, {"a"}) == ({"a": "board.blend"}, set())
+    finally:
+        quit.set()
+        instance.join()
+
+    # Once it is closed the folder is taken over, although board.blend still exists
+    assert RefPicker.start_sync(images_dir, {"a"}) == ({}, set())
+    with RefPicker.ownership_record(images_dir) as record:
+        assert record["folders"] == {"a": "board_v2.blend"}
+        assert [session["blend"] for session in record["sessions"].values()] == ["board_v2.blend"]
+
+
+def test_folder_used_by_another_instance_of_the_same_blend_file_is_kept(project, monkeypatch):
+    images_dir = str(project / "images")
+    monkeypatch.setattr(bpy_stub.bpy.data, "filepath", str(project / "board.blend"))
+    # The other instance added the frame "new", this one still has the older frame list
+    instance, quit = start_instance(project / "board.blend", {"a", "new"})
+    try:
+        assert RefPicker.start_sync(images_dir, {"a"}) == ({}, set())
+        assert RefPicker.remove_folder(images_dir, "new") is False
+        assert (project / "images" / "new").is_dir()
+    finally:
+        quit.set()
+        instance.join()
+
+    # Once that instance closes, no running instance uses the folder and it can go
+    assert RefPicker.start_sync(images_dir, {"a"}) == ({}, {"new"})
+    assert RefPicker.remove_folder(images_dir, "new") is True
+    assert not (project / "images" / "new").exists()
+    assert not (project / "images" / ".new.lock").exists()
+
+
+@pytest.mark.parametrize("content", ["", '{"folders": {"a": "board.blend"', "[]", '{"a": "board.blend"}'])
+def test_corrupt_ownership_record_raises_and_is_left_alone(project, content):
+    record_path = project / "images" / ".ref_picker_owners.json"
+    record_path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        RefPicker.start_sync(str(project / "images"), {"a"})
+    assert record_path.read_text(encoding="utf-8") == content
+
+
+def test_rename_follows_the_claim_rules_of_sync(project):
+    images_dir = str(project / "images")
+    (project / "images" / "a").mkdir()
+    RefPicker.start_sync(images_dir, {"a"})
+    instance, quit = start_instance(project / "board.blend", {"b"})
+    try:
+        assert "open in another Blender instance" in RefPicker.rename_folder(images_dir, "a", "b")
+        assert (project / "images" / "a").is_dir()
+    finally:
+        quit.set()
+        instance.join()
+
+    # board.blend is closed now, so its folder name can be taken over
+    (project / "images" / "b").rmdir()
+    assert RefPicker.rename_folder(images_dir, "a", "b") is None
+    assert (project / "images" / "b").is_dir() and not (project / "images" / "a").exists()
+    with RefPicker.ownership_record(images_dir) as record:
+        assert record["folders"] == {"b": "board_v2.blend"}
+        assert [session["folders"] for session in record["sessions"].values()] == [["b"]]
+
+
+def test_failed_folder_rename_leaves_the_record_alone(project, monkeypatch):
+    images_dir = str(project / "images")
+    (project / "images" / "a").mkdir()
+    RefPicker.start_sync(images_dir, {"a"})
+
+    def fail_rename(src, dst):
+        raise PermissionError("file in use")
+    monkeypatch.setattr(os, "rename", fail_rename)
+    with pytest.raises(OSError):
+        RefPicker.rename_folder(images_dir, "a", "b")
+    with RefPicker.ownership_record(images_dir) as record:
+        assert record["folders"] == {"a": "board_v2.blend"}